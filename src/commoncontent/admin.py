@@ -21,6 +21,8 @@ class AuthorAdmin(admin.ModelAdmin):
     prepopulated_fields = {"slug": ("name",)}
     list_display = ("name", "site")
     list_filter = ("site",)
+    ordering = ("name",)
+    search_fields = ("name",)
 
 
 #######################################################################################
@@ -32,6 +34,11 @@ class ImageAdmin(admin.ModelAdmin):
         return AdminThumbnail(image_field="small").__call__(instance)
 
     readonly_fields = ("width", "height", "mime_type", "thumbnail")
+    ordering = ("-upload_date",)
+    search_fields = ("title", "alt_text")
+    list_per_page = 50
+    # Skip the COUNT(*) over the whole table that backs "N total" in the changelist.
+    show_full_result_count = False
     fields = (
         "title",
         "thumbnail",
@@ -57,6 +64,7 @@ class CreativeWorkAdmin(admin.ModelAdmin):
     list_display = ("title", "date_published", "site", "status")
     list_filter = ("site", "status")
     search_fields = ("title", "description")
+    autocomplete_fields = ["author", "share_image"]
     fieldsets = (
         (
             None,
@@ -116,7 +124,10 @@ class CreativeWorkAdmin(admin.ModelAdmin):
 class ArticleAdmin(CreativeWorkAdmin):
     list_display = ("title", "section", "date_published", "site", "status")
     list_filter = ("section", "site", "status")
+    autocomplete_fields = ["author", "section", "share_image"]
     raw_id_fields = ["image_set"]
+    list_per_page = 50
+    show_full_result_count = False
     fieldsets = (
         (
             None,
@@ -159,6 +170,12 @@ class ArticleAdmin(CreativeWorkAdmin):
         ),
     )
 
+    def get_queryset(self, request):
+        # The default manager already joins site and section, which stops the admin
+        # from applying list_select_related. Section.__str__ needs the section's
+        # site, so join it here to avoid a query per changelist row.
+        return super().get_queryset(request).select_related("section__site")
+
 
 #######################################################################################
 @admin.register(ArticleSeries)
@@ -227,6 +244,8 @@ class HomePageAdmin(CreativeWorkAdmin):
 class LinkInline(admin.StackedInline):
     extra: int = 1
     model = Link
+    # A select widget would query every image once per inline form.
+    raw_id_fields = ["share_image"]
 
 
 @admin.register(Menu)
@@ -1,6 +1,15 @@
+import functools
+import re
+from types import MappingProxyType
+
 from django.apps import AppConfig, apps
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
+from commoncontent.common import get_sitevars
+
 # Apps required for static site generation
 CONTENT = [
     "commoncontent",
@@ -77,31 +86,48 @@ class CommonContentConfig(AppConfig):
     default_icon = "file-text"
     fallback_copyright = _("© Copyright {} {}. All rights reserved.")
 
+    @cached_property
+    def base_block_names(self):
+        """``base_blocks`` as a frozenset, for intersecting with view kwargs."""
+        return frozenset(self.base_blocks)
+
     @property
     def excerpt_max_words(self):
-        from django.conf import settings
-
         return getattr(settings, "COMMONCONTENT_EXCERPT_MAX_WORDS", 200)
 
     @property
+    def feed_cache_timeout(self):
+        """Seconds to cache rendered RSS feeds. 0 (the default) disables caching."""
+        return getattr(settings, "COMMONCONTENT_FEED_CACHE_TIMEOUT", 0)
+
+    @property
+    def homepage_cache_timeout(self):
+        """Seconds to cache each site's current HomePage."""
+        return getattr(settings, "COMMONCONTENT_HOMEPAGE_CACHE_TIMEOUT", 60)
+
+    @property
+    def menu_cache_timeout(self):
+        """Seconds to cache each Menu looked up by the ``menu`` template tag."""
+        return getattr(settings, "COMMONCONTENT_MENU_CACHE_TIMEOUT", 300)
+
+    @cached_property
     def pagebreak_separator(self):
-        from django.conf import settings
+        """Read once per process; reset when TINYMCE_DEFAULT_CONFIG is overridden."""
+        # TinyMCE may not be configured
+        return (getattr(settings, "TINYMCE_DEFAULT_CONFIG", None) or {}).get(
+            "pagebreak_separator", TINYMCE_CONFIG["pagebreak_separator"]
+        )
 
-        try:
-            return settings.TINYMCE_DEFAULT_CONFIG["pagebreak_separator"]
-        except Exception:
-            # May not be configured
-            return TINYMCE_CONFIG["pagebreak_separator"]
+    @property
+    def series_redirect_cache_timeout(self):
+        """Seconds to cache series redirects, on the server and in public HTTP caches.
+        0 (the default) disables caching."""
+        return getattr(settings, "COMMONCONTENT_SERIES_REDIRECT_CACHE_TIMEOUT", 0)
 
     @property
     def sitemap_changefreq(self):
         """How often search engines should check for article updates"""
-        from django.conf import settings
-
-        try:
-            return settings.SITEMAP_CHANGEFREQ
-        except Exception:
-            return "weekly"
+        return getattr(settings, "SITEMAP_CHANGEFREQ", "weekly")
 
     def as_dict(self) -> dict:
         return {
@@ -121,48 +147,88 @@ class CommonContentConfig(AppConfig):
         }
 
 
-# A context processor to add our vars to template contexts:
-def context_defaults(request):
-    """Supply default context variables for Common Content templates"""
+def _reset_cached_settings(setting, **kwargs):
+    if setting == "TINYMCE_DEFAULT_CONFIG":
+        apps.get_app_config("commoncontent").__dict__.pop("pagebreak_separator", None)
+
+
+setting_changed.connect(_reset_cached_settings)
+
+
+# The content block variables, and the list/detail settings (or SiteVars) that supply
+# them. Pairs of (context variable name, setting name).
+_LIST_BLOCKS = (
+    ("content_template", "list_content_template"),
+    ("precontent_template", "list_precontent_template"),
+    ("postcontent_template", "list_postcontent_template"),
+)
+_DETAIL_BLOCKS = (
+    ("content_template", "detail_content_template"),
+    ("precontent_template", "detail_precontent_template"),
+    ("postcontent_template", "detail_postcontent_template"),
+)
+
+
+@functools.lru_cache(maxsize=2)
+def _config_defaults(is_list: bool) -> dict:
+    """The app config's default values, with the content blocks for either list or
+    detail views filled in. These are class attributes that do not change at runtime,
+    so they are read once. Call ``_config_defaults.cache_clear()`` after reconfiguring
+    the app.
+    """
     # User could have installed a custom appconfig rather than using the default one
     # above, so always fetch it from Django.
-    conf = apps.get_app_config("commoncontent")
-    # Grab all the default configurations as a dictionary.
-    gvars = conf.as_dict()
+    gvars = apps.get_app_config("commoncontent").as_dict()
+    for name, setting in _LIST_BLOCKS if is_list else _DETAIL_BLOCKS:
+        gvars[name] = gvars[setting]
+    return gvars
 
-    # Set the content blocks based on whether the current view is a list or detail view
-    # (using a simple heuristic to determine listness.)
-    view = request.resolver_match.func
-    # For function-based views, check the name for obvious prefix/suffix
-    name = view.__name__
-    is_list = "_list" in name or name.startswith("list_")
+
+# Function-based view names with an obvious list prefix/suffix.
+_LIST_VIEW_NAME_RE = re.compile(r"^list_|_list")
+
+
+@functools.lru_cache(maxsize=512)
+def _is_list_view(view) -> bool:
+    """Whether a resolved view function presents a list, using a simple heuristic to
+    determine listness. The answer never changes for a given view, so it is memoized.
+    """
     # For class-based views, the func name is "view". Check for inheritence of List features.
     if hasattr(view, "view_class"):
         from django.views.generic.list import MultipleObjectMixin
 
-        is_list = issubclass(view.view_class, MultipleObjectMixin)
+        return issubclass(view.view_class, MultipleObjectMixin)
+    # For function-based views, check the name for obvious prefix/suffix
+    return _LIST_VIEW_NAME_RE.search(view.__name__) is not None
+
+
+# A context processor to add our vars to template contexts:
+def context_defaults(request):
+    """Supply default context variables for Common Content templates"""
+    # Computed once per request; every RequestContext rendered for the request (feeds,
+    # error pages, render_to_string with a request) reuses it, so it is read-only.
+    try:
+        return request._commoncontent_defaults
+    except AttributeError:
+        pass
+
+    # Choose the content blocks based on whether the current view is a list or detail
+    # view.
+    is_list = _is_list_view(request.resolver_match.func)
 
     # Edge case: SiteVars override our settings by having inject_sitevars context
     # processor come after this one. But if they override list_*_template, we need to
     # check that here, since we're assigning values they may not have set.
-    sitevars = request.site.vars
-    list_tpls = [
-        "list_content_template",
-        "list_precontent_template",
-        "list_postcontent_template",
-    ]
-    detail_tpls = [
-        "detail_content_template",
-        "detail_precontent_template",
-        "detail_postcontent_template",
-    ]
-    # Since we must support py38, we can't use removeprefix, so we slice instead.
-    if is_list:
-        for tpl in list_tpls:  # prefix == "list_"
-            gvars[tpl[5:]] = sitevars.get_value(tpl, gvars[tpl])
-    else:
-        for tpl in detail_tpls:  # prefix == "detail_"
-            gvars[tpl[7:]] = sitevars.get_value(tpl, gvars[tpl])
-
-    # And don't forget to return the value!!!
-    return gvars
+    # The site's vars are loaded once per request and shared with views.
+    sitevars = get_sitevars(request)
+    blocks = _LIST_BLOCKS if is_list else _DETAIL_BLOCKS
+
+    # The cached defaults for this kind of view, overlaid with any SiteVar overrides, as
+    # a new dict for this request.
+    request._commoncontent_defaults = MappingProxyType(
+        {
+            **_config_defaults(is_list),
+            **{n: sitevars[setting] for n, setting in blocks if setting in sitevars},
+        }
+    )
+    return request._commoncontent_defaults
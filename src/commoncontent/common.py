@@ -5,9 +5,12 @@ here to help avoid circular imports.
 
 from django.conf import settings
 from django.db import models
+from django.utils.html import format_html, mark_safe
 from django.utils.module_loading import import_string
 from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
+from django.utils.translation import to_locale
+from sitevars.context_processors import inject_sitevars
 
 
 # This vocabulary taken from IPTC standards, upon which https://schema.org/creativeWork
@@ -18,6 +21,37 @@ class Status(models.TextChoices):
     CANCELLED = "cancelled", _("Unpublish (cancelled)")
 
 
+class CachedPropertiesMixin:
+    """Model mixin for ``cached_property`` members derived from fields or relations. The
+    names listed in ``cached_properties`` are cleared whenever the instance is saved or
+    refreshed from the database, so they do not outlive the data they were read from.
+    """
+
+    cached_properties = ()
+
+    def clear_cached_properties(self):
+        for name in self.cached_properties:
+            self.__dict__.pop(name, None)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.clear_cached_properties()
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self.clear_cached_properties()
+
+
+def format_notice(notice, copyright_year):
+    """Fill the year into a copyright notice. Notices are admin-entered HTML, formatted
+    like ``format_html`` templates. Most have no ``{}`` placeholder, so those are
+    returned as-is without formatting.
+    """
+    if "{" not in notice and "}" not in notice:
+        return mark_safe(notice)
+    return format_html(notice, copyright_year)
+
+
 def upload_to(instance, filename):
     """Generate a path for uploaded files."""
     target = getattr(settings, "COMMONCONTENT_UPLOAD_TO", None)
@@ -27,3 +61,25 @@ def upload_to(instance, filename):
         return target(instance, filename)
     when = now()
     return f"{instance.site.domain}/{when.year}/{when.month}/{when.day}/{filename}"
+
+
+def default_locale():
+    """Default for locale fields: the project's LANGUAGE_CODE as a locale name, e.g.
+    "en-us" becomes "en_US". A callable, so migrations do not depend on the setting.
+    """
+    return to_locale(settings.LANGUAGE_CODE)
+
+
+def get_sitevars(request) -> dict:
+    """Return a dict of all SiteVars for the request's site, loading them only once
+    per request. Prefer this to repeated ``site.vars.get_value()`` calls when a request
+    is available. Values are the raw strings; callers must convert types themselves.
+    Without a request, the SiteVars for ``settings.SITE_ID`` are loaded on each call.
+    """
+    if request is None:
+        return inject_sitevars(request)
+    try:
+        return request._commoncontent_sitevars
+    except AttributeError:
+        request._commoncontent_sitevars = inject_sitevars(request)
+        return request._commoncontent_sitevars
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("commoncontent", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                fields=["section", "status", "date_published"],
+                name="commonconte_section_ff3e0f_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                fields=["author", "status", "date_published"],
+                name="commonconte_author__3db40f_idx",
+            ),
+        ),
+    ]
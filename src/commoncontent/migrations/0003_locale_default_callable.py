@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:04
+
+import commoncontent.common
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("commoncontent", "0002_article_list_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="article",
+            name="locale",
+            field=models.CharField(
+                default=commoncontent.common.default_locale,
+                max_length=10,
+                verbose_name="locale",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="attachment",
+            name="locale",
+            field=models.CharField(
+                default=commoncontent.common.default_locale,
+                max_length=10,
+                verbose_name="locale",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="homepage",
+            name="locale",
+            field=models.CharField(
+                default=commoncontent.common.default_locale,
+                max_length=10,
+                verbose_name="locale",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="image",
+            name="locale",
+            field=models.CharField(
+                default=commoncontent.common.default_locale,
+                max_length=10,
+                verbose_name="locale",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="page",
+            name="locale",
+            field=models.CharField(
+                default=commoncontent.common.default_locale,
+                max_length=10,
+                verbose_name="locale",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="section",
+            name="locale",
+            field=models.CharField(
+                default=commoncontent.common.default_locale,
+                max_length=10,
+                verbose_name="locale",
+            ),
+        ),
+    ]
@@ -1,21 +1,30 @@
+import functools
 import mimetypes
 
 from django.apps import apps
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.contrib.sites.models import Site
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.template.defaultfilters import truncatewords_html
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
-from django.utils.translation import to_locale
 from imagekit.models import ImageSpecField
 from imagekit.processors import ResizeToFill, ResizeToFit
 from taggit.managers import TaggableManager
 
-from commoncontent.common import Status, upload_to
+from commoncontent.common import (
+    CachedPropertiesMixin,
+    Status,
+    default_locale,
+    format_notice,
+    upload_to,
+)
 from commoncontent.schemas import (
     ImageProp,
     OGArticle,
@@ -24,8 +33,12 @@ from commoncontent.schemas import (
     ThingSchema,
 )
 
-# Transform "en-us" to "en_US"
-DEFAULT_LOCALE = to_locale(settings.LANGUAGE_CODE)
+
+@functools.lru_cache(maxsize=None)
+def _conf():
+    """The commoncontent app config. Looked up on first use, because the app registry
+    is not ready while this module is being imported."""
+    return apps.get_app_config("commoncontent")
 
 
 ######################################################################################
@@ -155,7 +168,7 @@ class Author(models.Model):
 ######################################################################################
 
 
-class AbstractCreativeWork(models.Model):
+class AbstractCreativeWork(CachedPropertiesMixin, models.Model):
     """
     <https://schema.org/CreativeWork>. CreativeWork is the base class for all content.
 
@@ -254,7 +267,7 @@ class AbstractCreativeWork(models.Model):
         max_length=255,
         blank=True,
     )
-    locale = models.CharField(_("locale"), max_length=10, default=DEFAULT_LOCALE)
+    locale = models.CharField(_("locale"), max_length=10, default=default_locale)
 
     tags = TaggableManager(blank=True)
 
@@ -274,6 +287,7 @@ class AbstractCreativeWork(models.Model):
     icon_name = "file"
     schema_type = "CreativeWork"
     opengraph_type = "website"
+    cached_properties = ("tag_names",)
 
     @property
     def copyright_holder(self):
@@ -295,23 +309,36 @@ class AbstractCreativeWork(models.Model):
 
     @property
     def copyright_notice(self):
-        conf = apps.get_app_config("commoncontent")
         var = self.site.vars
         if self.custom_copyright_notice:
-            return format_html(self.custom_copyright_notice, self.copyright_year)
+            return format_notice(self.custom_copyright_notice, self.copyright_year)
         elif self.author and self.author.copyright_notice:
-            return format_html(self.author.copyright_notice, self.copyright_year)
+            return format_notice(self.author.copyright_notice, self.copyright_year)
         elif notice := var.get_value("copyright_notice"):
-            return format_html(notice, self.copyright_year)
+            return format_notice(notice, self.copyright_year)
         else:
+            # The holder is plain text, so it is escaped by format_html.
             return format_html(
-                conf.fallback_copyright, self.copyright_year, self.copyright_holder
+                _conf().fallback_copyright, self.copyright_year, self.copyright_holder
             )
 
     @property
     def url(self):
         return f"https://{self.site.domain}{self.get_absolute_url()}"
 
+    @cached_property
+    def tag_names(self) -> list:
+        """Names of this object's tags, read once per instance and shared by the schema
+        and opengraph serializers. Uses tags from ``prefetch_related("tags")`` if any.
+        Cleared when the object's tags change.
+        """
+        try:
+            return [tag.name for tag in self.tags.all()]
+        except ValueError:
+            # ValueError: objects need to have a primary key value before you
+            # can access their tags.
+            return []
+
     @property
     def schema(self) -> ThingSchema:
         """Return the data as a schema.org object."""
@@ -328,13 +355,7 @@ class AbstractCreativeWork(models.Model):
         )
         if self.author:
             schema.author = self.author.schema
-        try:
-            tags = list(self.tags.names())
-        except ValueError:
-            # ValueError: objects need to have a primary key value before you
-            # can access their tags.
-            tags = []
-        if tags:
+        if tags := self.tag_names:
             schema.keywords = tags
         return schema
 
@@ -364,6 +385,14 @@ class AbstractCreativeWork(models.Model):
         return og
 
 
+def clear_tag_names(sender, instance, action, **kwargs):
+    if action.startswith("post_"):
+        instance.__dict__.pop("tag_names", None)
+
+
+m2m_changed.connect(clear_tag_names, sender=AbstractCreativeWork.tags.through)
+
+
 ######################################################################################
 # Media Objects
 ######################################################################################
@@ -620,20 +649,22 @@ class BasePage(AbstractCreativeWork):
     # Class properties
     schema_type = "WebPage"
     opengraph_type = "website"
+    cached_properties = AbstractCreativeWork.cached_properties + ("excerpt",)
 
     @property
     def icon_name(self):
         "name of an icon to represent this object"
         return self.custom_icon or self.site.vars.get_value("default_icon", "file-text")
 
-    @property
+    @cached_property
     def excerpt(self):
         """Rich text excerpt for use in teases and feed content. If no excerpt has
-        been specified, returns the full body text."""
-        config = apps.get_app_config("commoncontent")
+        been specified, returns the full body text. Cached, because list templates
+        read it once for display and again through has_excerpt."""
+        config = _conf()
         if not self.body:
             return ""
-        excerpt = self.body.split(config.pagebreak_separator, maxsplit=1)[0]
+        excerpt = self.body.partition(config.pagebreak_separator)[0]
         return truncatewords_html(excerpt, config.excerpt_max_words)
 
     @property
@@ -681,6 +712,26 @@ class Page(BasePage):
         return reverse("landing_page", kwargs={"page_slug": self.slug})
 
 
+#######################################################################
+HOMEPAGE_CACHE_KEY = "commoncontent.homepage.{}"
+
+
+class HomePageManager(GenericPageManager):
+    def get_current(self, site):
+        """Return the latest live HomePage for the given site, raising
+        HomePage.DoesNotExist if there is none. Found pages are cached for
+        ``COMMONCONTENT_HOMEPAGE_CACHE_TIMEOUT`` seconds, and the cache is cleared
+        whenever a HomePage is saved or deleted.
+        """
+        key = HOMEPAGE_CACHE_KEY.format(site.pk)
+        home = cache.get(key)
+        if home is None:
+            home = self.live().filter(site=site).latest()
+            timeout = _conf().homepage_cache_timeout
+            cache.set(key, home, timeout)
+        return home
+
+
 #######################################################################
 class HomePage(BasePage):
     "A model to represent the site home page."
@@ -691,7 +742,7 @@ class HomePage(BasePage):
         unique=True,
         help_text=_("Name used in the admin to distinguish from other home pages"),
     )
-    objects = GenericPageManager.from_queryset(CreativeWorkQuerySet)()
+    objects = HomePageManager.from_queryset(CreativeWorkQuerySet)()
 
     class Meta(BasePage.Meta):
         verbose_name = _("home page")
@@ -700,6 +751,30 @@ class HomePage(BasePage):
     def get_absolute_url(self):
         return reverse("home_page")
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the site the page was loaded from, so that moving it to another site
+        # also clears the old site's cached home page.
+        if "site_id" not in instance.get_deferred_fields():
+            instance._loaded_site_id = instance.site_id
+        return instance
+
+
+def clear_homepage_cache(sender, instance, **kwargs):
+    # Wait for the commit, or a concurrent request could cache the old page again.
+    site_ids = {
+        instance.site_id,
+        getattr(instance, "_loaded_site_id", instance.site_id),
+    }
+    keys = [HOMEPAGE_CACHE_KEY.format(site_id) for site_id in site_ids]
+    instance._loaded_site_id = instance.site_id
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+post_save.connect(clear_homepage_cache, sender=HomePage)
+post_delete.connect(clear_homepage_cache, sender=HomePage)
+
 
 #######################################################################
 class ArticleSeries(models.Model):
@@ -769,7 +844,11 @@ class Article(BasePage):
                     "section",
                     "slug",
                 ]
-            )
+            ),
+            # Section and author lists (and their feeds) filter on one of these and
+            # order by date, so the newest live articles are a single range read.
+            models.Index(fields=["section", "status", "date_published"]),
+            models.Index(fields=["author", "status", "date_published"]),
         ]
 
     def save(self, *args, **kwargs):
@@ -828,8 +907,7 @@ class Article(BasePage):
             og.image = [self.share_image.opengraph]
         if self.author:
             og.author = [self.author.url]
-        tags = list(self.tags.names())
-        if tags:
+        if tags := self.tag_names:
             og.tag = tags
         return og
 
@@ -846,7 +924,30 @@ class Article(BasePage):
 #######################################################################
 # Site Menus
 #######################################################################
-class Menu(models.Model):
+MENU_CACHE_KEY = "commoncontent.menu.{}.{}"
+
+
+class MenuManager(models.Manager):
+    def get_for_site(self, site, slug):
+        """Return the Menu with the given slug for the given site, with its links
+        loaded, raising Menu.DoesNotExist if there is none. Found menus are cached for
+        ``COMMONCONTENT_MENU_CACHE_TIMEOUT`` seconds, and the cache is cleared whenever
+        the Menu or one of its Links is saved or deleted.
+        """
+        key = MENU_CACHE_KEY.format(site.pk, slug)
+        menu = cache.get(key)
+        if menu is None:
+            menu = (
+                self.select_related("site")
+                .prefetch_related("link_set")
+                .get(site=site, slug=slug)
+            )
+            timeout = _conf().menu_cache_timeout
+            cache.set(key, menu, timeout)
+        return menu
+
+
+class Menu(CachedPropertiesMixin, models.Model):
     site = models.ForeignKey(Site, on_delete=models.CASCADE, verbose_name=_("site"))
     admin_name = models.CharField(_("admin name"), max_length=255)
     slug = models.SlugField(
@@ -856,6 +957,8 @@ class Menu(models.Model):
         ),
     )
     title = models.CharField(_("title"), max_length=255, blank=True)
+    objects = MenuManager()
+    cached_properties = ("links",)
 
     class Meta:
         unique_together = ("site", "slug")
@@ -863,9 +966,22 @@ class Menu(models.Model):
     def __str__(self):
         return self.admin_name
 
-    @property
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember where the menu was loaded from, so that renaming it (or moving it to
+        # another site) also clears the cache under its old slug.
+        if not {"site_id", "slug"} & instance.get_deferred_fields():
+            instance._loaded_cache_key = MENU_CACHE_KEY.format(
+                instance.site_id, instance.slug
+            )
+        return instance
+
+    @cached_property
     def links(self):
-        return self.link_set.all()
+        # Evaluated once, like SectionMenu.links, so a template can loop over the links
+        # more than once. Uses links from prefetch_related("link_set") if any.
+        return list(self.link_set.all())
 
 
 class Link(models.Model):
@@ -909,10 +1025,19 @@ class Link(models.Model):
     def __str__(self):
         return format_html('<a href="{}">{}</a>', self.url, self.title)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the menu the link was loaded from, so that moving it to another menu
+        # also clears the old menu from the cache.
+        if "menu_id" not in instance.get_deferred_fields():
+            instance._loaded_menu_id = instance.menu_id
+        return instance
+
     @property
     def icon_name(self):
         "name of an icon to represent this object"
-        return self.custom_icon or self.site.vars.get_value(
+        return self.custom_icon or self.menu.site.vars.get_value(
             "default_icon", "link-45deg"
         )
 
@@ -923,19 +1048,50 @@ class Link(models.Model):
         return []
 
 
+def clear_menu_cache(sender, instance, **kwargs):
+    # The keys are found now, while the menu rows still exist, but only deleted once the
+    # transaction commits. Deleting them sooner would let a concurrent request cache the
+    # old rows again.
+    if isinstance(instance, Link):
+        menu_ids = {instance.menu_id, getattr(instance, "_loaded_menu_id", None)}
+        menus = Menu.objects.filter(pk__in=menu_ids - {None})
+        keys = {
+            MENU_CACHE_KEY.format(site_id, slug)
+            for site_id, slug in menus.values_list("site_id", "slug")
+        }
+        instance._loaded_menu_id = instance.menu_id
+    else:
+        key = MENU_CACHE_KEY.format(instance.site_id, instance.slug)
+        keys = {key, getattr(instance, "_loaded_cache_key", key)}
+        instance._loaded_cache_key = key
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+post_save.connect(clear_menu_cache, sender=Menu)
+post_delete.connect(clear_menu_cache, sender=Menu)
+post_save.connect(clear_menu_cache, sender=Link)
+post_delete.connect(clear_menu_cache, sender=Link)
+
+
 class SectionMenu:
     def __init__(self, site: Site, title: str = "", sections=None, pages=None) -> None:
         self.site = site
         self.title = title
-        self.sections = sections or Section.objects.live().filter(site=site).order_by(
-            "title"
-        )
+        # Menus only need titles and URLs, so skip loading the section bodies. An empty
+        # list of sections is respected rather than replaced by a query.
+        if sections is None:
+            sections = (
+                Section.objects.live().filter(site=site).defer("body").order_by("title")
+            )
+        self.sections = sections
         self.pages = pages
 
-    @property
+    @cached_property
     def links(self):
+        # Cached so that templates that render the menu more than once (e.g. header
+        # and footer) do not re-run the queries.
         try:
-            home = HomePage.objects.live().filter(site=self.site).latest()
+            home = HomePage.objects.get_current(self.site)
         except HomePage.DoesNotExist:
             home = HomePage(
                 site=self.site,
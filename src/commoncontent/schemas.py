@@ -4,18 +4,30 @@ Schema.org and Open Graph <https://ogp.me/>.
 """
 
 import dataclasses
+import functools
 import typing as T
 import urllib.parse
 from datetime import date
 from enum import Enum
 
 from django.db import models
-from django.utils.html import escape, format_html, json_script, mark_safe, strip_tags
+from django.utils.html import (
+    conditional_escape,
+    escape,
+    json_script,
+    mark_safe,
+    strip_tags,
+)
 
 from commoncontent.common import Status
 
 
+@functools.lru_cache(maxsize=1024)
 def validate_http_url(value):
+    """Return value if it is an absolute http(s) URL, else raise ValueError. The same
+    URLs (site, author, share images) are validated many times per page, so valid
+    results are cached; errors are not.
+    """
     parsed_url = urllib.parse.urlparse(value)
     if not all([parsed_url.scheme, parsed_url.netloc]):
         raise ValueError(f"{value} is not a valid URL")
@@ -24,19 +36,40 @@ def validate_http_url(value):
     return value
 
 
+def _isoify(obj, names):
+    """Convert any date values in the named attributes of obj to ISO format strings."""
+    for name in names:
+        val = getattr(obj, name, None)
+        # Fun fact: datetime is a subclass of date, so this covers both
+        if isinstance(val, date):
+            setattr(obj, name, val.isoformat())
+
+
 ########################################################################################
 # Schema.org objects
 ########################################################################################
+@functools.lru_cache(maxsize=None)
+def _field_names(cls):
+    """The dataclass field names of cls, in order. Fields are fixed when the class is
+    defined, so they are read once per class rather than on every serialization.
+    """
+    return tuple(field.name for field in dataclasses.fields(cls))
+
+
 class SchemaBase:
     def asdict(self):
-        return {k: v for k, v in self.items() if v is not None}
+        return {
+            name: value
+            for name in _field_names(type(self))
+            if (value := getattr(self, name)) is not None
+        }
 
     def items(self):
         """Yield the name and value of each field in the dataclass (similar to the dict
         method).
         """
-        for field in dataclasses.fields(self):
-            yield field.name, getattr(self, field.name)
+        for name in _field_names(type(self)):
+            yield name, getattr(self, name)
 
     def safe_dict(self):
         """Return a dictionary of the object's fields with HTML escaped values."""
@@ -107,14 +140,14 @@ class CreativeWorkSchema(ThingSchema):
     headline: T.Optional[str] = None
     keywords: T.Optional[str] = None
     _label: T.ClassVar[str] = "CreativeWork"
+    _date_fields: T.ClassVar[T.Tuple[str, ...]] = (
+        "datePublished",
+        "dateModified",
+        "expires",
+    )
 
     def __post_init__(self):
-        if self.datePublished and isinstance(self.datePublished, date):
-            self.datePublished = self.datePublished.isoformat()
-        if self.dateModified and isinstance(self.dateModified, date):
-            self.dateModified = self.dateModified.isoformat()
-        if self.expires and isinstance(self.expires, date):
-            self.expires = self.expires.isoformat()
+        _isoify(self, self._date_fields)
         if isinstance(self.author, models.Model):
             self.author = str(self.author)
 
@@ -186,6 +219,29 @@ class PersonSchema(ThingSchema):
 ########################################################################################
 metatag = '<meta property="{}:{}" content="{}" />\n'
 
+# The attributes each Open Graph class emits in its own namespace. Subclass attributes
+# are tuples in field order, since subclasses read them directly rather than scanning
+# every inherited field.
+_OG_BASIC_ATTRS = frozenset(
+    ("description", "determiner", "locale", "site_name", "title", "type")
+)
+_OG_LIST_ATTRS = frozenset(("audio", "image", "video"))
+_ARTICLE_ATTRS = ("published_time", "modified_time", "expiration_time", "section")
+_BOOK_ATTRS = ("isbn", "release_date")
+_PROFILE_ATTRS = ("first_name", "last_name", "username", "gender")
+
+
+def _emit_meta(ns, attr, content, _fmt=metatag.format, _esc=conditional_escape):
+    """Render a single Open Graph meta tag.
+
+    The namespace and attribute names are controlled by this module, so only the
+    content needs escaping. As with ``format_html``, content that is already safe
+    (e.g. a formatted copyright notice) is not escaped again. This skips the
+    per-argument overhead of ``format_html``, which is called dozens of times per page
+    render.
+    """
+    return mark_safe(_fmt(ns, attr, _esc(content)))
+
 
 class OGGender(Enum):
     "Gender as defined at ogp.me. Sorry non-binary folks, FB hates you."
@@ -210,15 +266,18 @@ class StructuredProperty(SchemaBase):
             self.secure_url = validate_http_url(self.secure_url)
 
     def __str__(self):
+        return mark_safe("".join(self.meta_tags()))
+
+    def meta_tags(self):
+        """Yield the meta tags for this property, one string per tag."""
         if not self._prefix:
-            return ""
-        val = format_html(metatag, "og", self._prefix, self.url)
+            return
+        yield _emit_meta("og", self._prefix, self.url)
         for attr, content in self.items():
             if attr == "url":
                 continue
             if content:
-                val += format_html(metatag, f"og:{self._prefix}", attr, content)
-        return val
+                yield _emit_meta(f"og:{self._prefix}", attr, content)
 
     def get_absolute_url(self):
         return self.url.path
@@ -270,23 +329,29 @@ class OpenGraph(SchemaBase):
             self.image = [self.image]
 
     def __str__(self):
+        # Build all the tags first and join once, rather than growing a string with
+        # repeated concatenation.
+        return mark_safe("".join(self.meta_tags()))
+
+    def meta_tags(self):
+        """Yield the meta tags for this object, one string per tag. Subclasses extend
+        this to add the tags for their own namespace.
+        """
         # Subclasses with attrs will use a separate namespace for them, so here we ONLY
         # want to output what's implemented in this class.
-        basic_attrs = "description determiner locale site_name title type".split()
-        val = format_html(metatag, "og", "url", self.url)
+        yield _emit_meta("og", "url", self.url)
         for attr, content in self.items():
             if attr == "url" or content is None:
                 continue
-            elif attr in ("audio", "image", "video"):
+            elif attr in _OG_LIST_ATTRS:
                 # These are lists of StructuredProps
                 for item in content:
-                    val += str(item)
+                    yield str(item)
             elif attr == "locale_alternate":
                 for locale in content:
-                    val += format_html(metatag, "og", attr, locale)
-            elif content and attr in basic_attrs:
-                val += format_html(metatag, "og", attr, content)
-        return val
+                    yield _emit_meta("og", attr, locale)
+            elif content and attr in _OG_BASIC_ATTRS:
+                yield _emit_meta("og", attr, content)
 
 
 @dataclasses.dataclass
@@ -301,6 +366,11 @@ class OGArticle(OpenGraph):
     # Structured properties
     author: T.Optional[T.List[T.Union[str, models.Model]]] = None
     tag: T.Optional[T.List[str]] = None
+    _date_fields: T.ClassVar[T.Tuple[str, ...]] = (
+        "published_time",
+        "modified_time",
+        "expiration_time",
+    )
 
     def __post_init__(self, *args, **kwargs):
         super().__post_init__(*args, **kwargs)
@@ -308,26 +378,17 @@ class OGArticle(OpenGraph):
         self.type = "article"
         if isinstance(self.section, models.Model):
             self.section = str(self.section)
+        _isoify(self, self._date_fields)
 
-        for f in ("published_time", "modified_time", "expiration_time"):
-            val = getattr(self, f)
-            # Fun fact: datetime is a subclass of date, so this covers both
-            if isinstance(val, date):
-                setattr(self, f, val.isoformat())
-
-    def __str__(self):
-        val = super().__str__()
+    def meta_tags(self):
+        yield from super().meta_tags()
         prefix = "article"
-        article_props = "published_time modified_time expiration_time section".split()
-        for attr, content in self.items():
-            if content is None:
-                continue
-            elif attr in article_props:
-                val += format_html(metatag, prefix, attr, content)
-            elif attr in ("author", "tag"):
-                for tag in content:
-                    val += format_html(metatag, prefix, attr, tag)
-        return val
+        for attr in _ARTICLE_ATTRS:
+            if (content := getattr(self, attr)) is not None:
+                yield _emit_meta(prefix, attr, content)
+        for attr in ("author", "tag"):
+            for tag in getattr(self, attr) or ():
+                yield _emit_meta(prefix, attr, tag)
 
 
 @dataclasses.dataclass
@@ -340,6 +401,7 @@ class OGBook(OpenGraph):
     # Structured properties
     author: T.Optional[T.List[T.Union[str, models.Model]]] = None
     tag: T.Optional[T.List[str]] = None
+    _date_fields: T.ClassVar[T.Tuple[str, ...]] = ("release_date",)
 
     def __post_init__(self, *args, **kwargs):
         super().__post_init__(*args, **kwargs)
@@ -350,22 +412,17 @@ class OGBook(OpenGraph):
             self.author = [str(self.author)]
         elif self.author:
             self.author = [str(author) for author in self.author]
-        if self.release_date and isinstance(self.release_date, date):
-            self.release_date = self.release_date.isoformat()
+        _isoify(self, self._date_fields)
 
-    def __str__(self):
-        val = super().__str__()
+    def meta_tags(self):
+        yield from super().meta_tags()
         prefix = "book"
-        book_props = "author isbn release_date".split()
-        for attr, content in self.items():
-            if content is None:
-                continue
-            elif attr in book_props:
-                val += format_html(metatag, prefix, attr, content)
-            elif attr in ("author", "tag"):
-                for tag in content:
-                    val += format_html(metatag, prefix, attr, tag)
-        return val
+        for attr in _BOOK_ATTRS:
+            if (content := getattr(self, attr)) is not None:
+                yield _emit_meta(prefix, attr, content)
+        for attr in ("author", "tag"):
+            for tag in getattr(self, attr) or ():
+                yield _emit_meta(prefix, attr, tag)
 
 
 # @dataclasses.dataclass
@@ -385,17 +442,16 @@ class OGBook(OpenGraph):
 #     writer: T.List[str] = dataclasses.field(default_factory=list)
 #     tag: T.List[str] = dataclasses.field(default_factory=list)
 
-#     def __str__(self):
-#         val = super().__str__()
+#     def meta_tags(self):
+#         yield from super().meta_tags()
 #         prefix = "video"
 #         video_props = "duration release_date".split()
 #         for attr, content in self.items():
 #             if attr in video_props and content:
-#                 val += format_html(metatag, prefix, attr, content)
+#                 yield _emit_meta(prefix, attr, content)
 #             elif attr in ("actor", "director", "tag", "writer") and content:
 #                 for tag in content:
-#                     val += format_html(metatag, prefix, attr, tag)
-#         return val
+#                     yield _emit_meta(prefix, attr, tag)
 
 
 # @dataclasses.dataclass
@@ -419,11 +475,10 @@ class OGBook(OpenGraph):
 #     series: T.Optional[OGTVShow]
 #     type: str = "video.episode"
 
-#     def __str__(self):
-#         val = super().__str__()
+#     def meta_tags(self):
+#         yield from super().meta_tags()
 #         if self.series:
-#             val += format_html(metatag, "video", "series", self.series)
-#         return val
+#             yield _emit_meta("video", "series", self.series)
 
 
 @dataclasses.dataclass
@@ -440,13 +495,11 @@ class OGProfile(OpenGraph):
         # Force the type to profile
         self.type = "profile"
 
-    def __str__(self):
-        val = super().__str__()
-        profile_props = "first_name last_name username gender".split()
-        for attr, content in self.items():
-            if content and attr in profile_props:
-                val += format_html(metatag, "profile", attr, content)
-        return val
+    def meta_tags(self):
+        yield from super().meta_tags()
+        for attr in _PROFILE_ATTRS:
+            if content := getattr(self, attr):
+                yield _emit_meta("profile", attr, content)
 
 
 # Omitting the music category of objects for now.
@@ -15,7 +15,8 @@ class SiteAwareSiteMap(Sitemap):
         return super().get_urls(site=site, **kwargs)
 
     def items(self):
-        return self.model.objects.live().filter(site=self.site)
+        # Sitemaps only need URLs and dates, so skip loading the page bodies.
+        return self.model.objects.live().filter(site=self.site).defer("body")
 
     def lastmod(self, obj):
         return obj.date_modified
@@ -57,7 +58,7 @@ class HomePageSitemap(SiteAwareSiteMap):
     model = HomePage
 
     def items(self):
-        return [HomePage.objects.live().filter(site=self.site).latest()]
+        return [HomePage.objects.get_current(self.site)]
 
 
 sitemaps = {
@@ -1,3 +1,4 @@
+from commoncontent.common import format_notice, get_sitevars
 from commoncontent.models import Menu, SectionMenu
 from django import template
 from django.contrib.sites.shortcuts import get_current_site
@@ -21,17 +22,9 @@ def add_classes(value, arg):
 
     ``{{ form.username|add_classes:"form-control" }}``
     """
-    css_classes = value.field.widget.attrs.get("class", "")
-    # check if class is set or empty and split its content to list (or init list)
-    if css_classes:
-        css_classes = css_classes.split(" ")
-    else:
-        css_classes = []
-    # prepare new classes to list
-    args = arg.split(" ")
-    for a in args:
-        if a not in css_classes:
-            css_classes.append(a)
+    css_classes = value.field.widget.attrs.get("class", "").split()
+    # dict.fromkeys drops duplicates while keeping the existing classes first
+    css_classes = dict.fromkeys(css_classes + arg.split())
     # join back to single string
     return value.as_widget(attrs={"class": " ".join(css_classes)})
 
@@ -61,7 +54,6 @@ def copyright_notice(context):
     """Return a copyright notice for the current page."""
     obj = context.get("object")
     request = context.get("request")
-    site = get_current_site(request)
     notice = ""
     # First we check if the "object" (for detail views) knows its own copyright.
     if obj and hasattr(obj, "copyright_year"):
@@ -72,13 +64,15 @@ def copyright_notice(context):
     if obj and hasattr(obj, "copyright_notice"):
         notice = obj.copyright_notice
     if notice:
-        return format_html(notice, copyright_year)
+        return format_notice(notice, copyright_year)
 
-    # Otherwise, we fall back to the site's copyright. Is one explicitly set?
-    if notice := site.vars.get_value("copyright_notice"):
-        return format_html(notice, copyright_year)
+    # Otherwise, we fall back to the site's copyright, using the SiteVars already loaded
+    # for this request. Is one explicitly set?
+    sitevars = get_sitevars(request)
+    if notice := sitevars.get("copyright_notice"):
+        return format_notice(notice, copyright_year)
     else:
-        holder = site.vars.get_value("copyright_holder", site.name)
+        holder = sitevars.get("copyright_holder") or get_current_site(request).name
         return format_html(
             "© Copyright {} {}. All rights reserved.", copyright_year, holder
         )
@@ -90,11 +84,14 @@ def menu(context, menu_slug):
 
     ``{% menu "main-nav" as menu %}``
     """
-    request = context.get("request")
+    return _get_menu(context.get("request"), menu_slug)
+
+
+def _get_menu(request, menu_slug):
     site = get_current_site(request)
     menu = None
     try:
-        menu = Menu.objects.get(site=site, slug=menu_slug)
+        menu = Menu.objects.get_for_site(site, menu_slug)
     except Menu.DoesNotExist:
         # Special case for the magic slug "main-nav"
         if menu_slug == "main-nav":
@@ -102,6 +99,35 @@ def menu(context, menu_slug):
     return menu
 
 
+@register.inclusion_tag("commoncontent/includes/menu_nav.html", takes_context=True)
+def menu_nav(context, menu_slug):
+    """Renders the named menu as a list of nav links, marking the current section.
+
+    Equivalent to looping over the ``menu`` tag's links and calling ``menu_active`` and
+    ``menu_aria_current`` for each, but looks up the menu and request path only once.
+
+    ``{% menu_nav "main-nav" %}``
+    """
+    request = context["request"]
+    menu = _get_menu(request, menu_slug)
+    path = str(request.path)
+    items = []
+    for link in menu.links if menu else ():
+        url = link.get_absolute_url() if hasattr(link, "get_absolute_url") else link.url
+        if path == url:
+            aria_current = "page"
+        elif path.startswith(url):
+            aria_current = "section"
+        else:
+            aria_current = ""
+        # Special case for "/" because every url starts with /
+        active = path == "/" if url == "/" else bool(aria_current)
+        items.append(
+            {"link": link, "url": url, "active": active, "aria_current": aria_current}
+        )
+    return {"menu": menu, "items": items}
+
+
 @register.simple_tag(takes_context=True)
 def menu_active(context, menuitem: str):
     """Returns 'active' if the current URL is "under" the given URL.
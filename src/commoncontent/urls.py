@@ -14,11 +14,34 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
-from django.urls import path
+from django.urls import include, path
 from django.views.generic import RedirectView
 
 from commoncontent import views as generic
 
+# Patterns relative to "<section_slug>/". Pagination must come before articles, since
+# "page_2" is also a valid article slug.
+section_patterns = [
+    path(
+        "page_<int:page>.html", generic.SectionView.as_view(), name="section_paginated"
+    ),
+    path(
+        "<slug:series_slug>/<slug:article_slug>.html",
+        generic.ArticleDetailView.as_view(),
+        name="article_series_page",
+    ),
+    path(
+        "<slug:series_slug>/", generic.ArticleSeriesView.as_view(), name="series_page"
+    ),
+    path(
+        "<slug:article_slug>.html",
+        generic.ArticleDetailView.as_view(),
+        name="article_page",
+    ),
+    path("", generic.SectionView.as_view(), name="section_page"),
+    path("index.rss", generic.SectionFeed(), name="section_feed"),
+]
+
 urlpatterns = [
     path(
         "<slug:section_slug>/feed/", RedirectView.as_view(pattern_name="section_feed")
@@ -38,31 +61,12 @@ urlpatterns = [
     path(
         "author/<slug:author_slug>/", generic.AuthorView.as_view(), name="author_page"
     ),
-    path(
-        "<slug:section_slug>/page_<int:page>.html",
-        generic.SectionView.as_view(),
-        name="section_paginated",
-    ),
-    path(
-        "<slug:section_slug>/<slug:series_slug>/<slug:article_slug>.html",
-        generic.ArticleDetailView.as_view(),
-        name="article_series_page",
-    ),
-    path(
-        "<slug:section_slug>/<slug:series_slug>/",
-        generic.ArticleSeriesView.as_view(),
-        name="series_page",
-    ),
-    path(
-        "<slug:section_slug>/<slug:article_slug>.html",
-        generic.ArticleDetailView.as_view(),
-        name="article_page",
-    ),
+    # URLs under a section share one prefix match; the resolver only tries these
+    # patterns for paths that start with a section slug.
+    path("<slug:section_slug>/", include(section_patterns)),
     path(
         "<slug:page_slug>.html", generic.PageDetailView.as_view(), name="landing_page"
     ),
-    path("<slug:section_slug>/", generic.SectionView.as_view(), name="section_page"),
-    path("<slug:section_slug>/index.rss", generic.SectionFeed(), name="section_feed"),
     path("index.rss", generic.SiteFeed(), name="site_feed"),
     path("", generic.HomePageView.as_view(), name="home_page"),
 ]
@@ -1,30 +1,62 @@
+import copy
+import hashlib
 import typing as T
 
 from django.apps import apps
 from django.contrib.sites.shortcuts import get_current_site
 from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.feedgenerator import Rss201rev2Feed
+from django.utils.cache import patch_cache_control
+from django.utils.functional import cached_property
 from django.views.generic import DetailView, ListView, RedirectView
+from sitevars.models import SiteVar
 
-from commoncontent.models import Article, ArticleSeries, Author, HomePage, Page, Section
+from commoncontent.common import get_sitevars
+from commoncontent.models import Article, Author, HomePage, Page, Section
+
+conf = apps.get_app_config("commoncontent")
 
 
 ######################################################################################
-class BasePageDetailView(DetailView):
+class SiteCachedMixin:
+    """Looks up the current site once per view instance (i.e. once per request), and
+    supplies the site-dependent fallbacks for template names.
+    """
+
+    # The last resort templates, after any per-object or per-site choices.
+    fallback_template_names = ("commoncontent/base.html",)
+
+    @cached_property
+    def current_site(self):
+        return get_current_site(self.request)
+
+    def get_fallback_template_names(self):
+        """Return the site's default base template (if set) followed by the
+        ``fallback_template_names``.
+        """
+        if site_default := get_sitevars(self.request).get("base_template"):
+            return [site_default, *self.fallback_template_names]
+        return list(self.fallback_template_names)
+
+
+######################################################################################
+class BasePageDetailView(SiteCachedMixin, DetailView):
     template_name_field = "base_template"
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        conf = apps.get_app_config("commoncontent")
-
         context["opengraph"] = self.object.opengraph
 
         # Allow passing kwargs in the urlconf to override the default block templates
-        for block in conf.base_blocks:
-            if tpl := self.kwargs.get(block):
+        for block in conf.base_block_names.intersection(self.kwargs):
+            if tpl := self.kwargs[block]:
                 context[block] = tpl
 
         if custom_template := getattr(self.object, "content_template", ""):
@@ -40,32 +72,45 @@ class BasePageDetailView(DetailView):
         # thanks to template_name_field.
         names = super().get_template_names()
 
-        # Fall back to site default if set
-        var = self.object.site.vars
-        if site_default := var.get_value("base_template"):
-            names.append(site_default)
-
-        # Fall back to commoncontent default
-        names.append("commoncontent/base.html")
-
+        # Fall back to site default if set, then commoncontent default
+        names.extend(self.get_fallback_template_names())
         return names
 
 
 ######################################################################################
-class ArticleSeriesView(RedirectView):
+class ArticleSeriesView(SiteCachedMixin, RedirectView):
     """Redirects to the first article in a series."""
 
     permanent = True
 
+    def get(self, request, *args, **kwargs):
+        response = super().get(request, *args, **kwargs)
+        if timeout := conf.series_redirect_cache_timeout:
+            patch_cache_control(response, public=True, max_age=timeout)
+        return response
+
     def get_redirect_url(self, *args, **kwargs):
-        series = get_object_or_404(
-            ArticleSeries.objects.filter(
-                site=get_current_site(self.request),
-                slug=kwargs["series_slug"],
+        timeout = conf.series_redirect_cache_timeout
+        key = "commoncontent.series_redirect.{}.{}".format(
+            self.current_site.pk, kwargs["series_slug"]
+        )
+        if timeout and (url := cache.get(key)):
+            return url
+
+        # A single query for the first live article, joined with its section and series
+        # (by ArticleManager) which are needed to build the URL.
+        article = (
+            Article.objects.live()
+            .filter(
+                site=self.current_site,
+                series__slug=kwargs["series_slug"],
             )
+            .order_by("_order")
+            .first()
         )
-        article = series.article_set.live().first()
-        return reverse(
+        if article is None:
+            raise Http404("No live articles in this series")
+        url = reverse(
             "article_series_page",
             kwargs={
                 "section_slug": article.section.slug,
@@ -73,6 +118,9 @@ class ArticleSeriesView(RedirectView):
                 "article_slug": article.slug,
             },
         )
+        if timeout:
+            cache.set(key, url, timeout)
+        return url
 
 
 ######################################################################################
@@ -85,14 +133,17 @@ class ArticleDetailView(BasePageDetailView):
             or kwargs["series_slug"] != self.object.series.slug
         ):
             return redirect(self.object, permanent=True)
-        return super().get(request, *args, **kwargs)
+        # Render directly rather than via super().get(), which would fetch the
+        # article a second time.
+        context = self.get_context_data(object=self.object)
+        return self.render_to_response(context)
 
     def get_object(self):
         # This lookup ignores the series_slug. Article slugs are still required to be
         # unique within their section, even if in a series
         return get_object_or_404(
             Article.objects.live().filter(
-                site=get_current_site(self.request),
+                site=self.current_site,
                 section__slug=self.kwargs["section_slug"],
                 slug=self.kwargs["article_slug"],
             )
@@ -104,14 +155,41 @@ class PageDetailView(BasePageDetailView):
     def get_object(self):
         return get_object_or_404(
             Page.objects.live().filter(
-                site=get_current_site(self.request),
+                site=self.current_site,
                 slug=self.kwargs["page_slug"],
             )
         )
 
 
 ######################################################################################
-class BasePageListView(ListView):
+class ShortListPaginator(Paginator):
+    """A Paginator that serves the first page from a single slice query, running the
+    COUNT query only when that slice shows there are further pages.
+
+    Most sections and author pages fit on one page, so the COUNT is usually skipped.
+    Later pages need the total to validate the page number and behave as usual.
+    """
+
+    def page(self, number):
+        try:
+            first_page = int(number) == 1
+        except (TypeError, ValueError):
+            first_page = False
+        if not first_page:
+            return super().page(number)
+
+        # Fetch one row more than the last page can hold, to learn whether more exist
+        limit = self.per_page + self.orphans
+        head = list(self.object_list[: limit + 1])
+        if len(head) <= limit:
+            # Everything fits on this page, so the count is known.
+            self.count = len(head)
+            return self._get_page(head, 1, self)
+        return self._get_page(head[: self.per_page], 1, self)
+
+
+######################################################################################
+class BasePageListView(SiteCachedMixin, ListView):
     """View for pages that present a list of articles (e.g. SectionPage, HomePage).
 
     The `get_object` method is left unimplemented here, as it will be different for
@@ -120,6 +198,7 @@ class BasePageListView(ListView):
     """
 
     object = None
+    paginator_class = ShortListPaginator
     # template_name_suffix = "_list" is supplied by ListView
 
     def get(self, request, *args, **kwargs):
@@ -127,7 +206,6 @@ class BasePageListView(ListView):
         return super().get(request, *args, **kwargs)
 
     def get_context_data(self, **kwargs):
-        conf = apps.get_app_config("commoncontent")
         context = super().get_context_data(**kwargs)
         context["object"] = self.object
         context["opengraph"] = self.object.opengraph
@@ -135,8 +213,8 @@ class BasePageListView(ListView):
             context["content_template"] = content_template
 
         # Allow passing kwargs in the urlconf to override the default block templates
-        for block in conf.base_blocks:
-            if tpl := self.kwargs.get(block):
+        for block in conf.base_block_names.intersection(self.kwargs):
+            if tpl := self.kwargs[block]:
                 context[block] = tpl
 
         return context
@@ -152,18 +230,19 @@ class BasePageListView(ListView):
         if paginate_by := super().get_paginate_by(queryset):
             return paginate_by
         # Fall back to per-site setting or None
-        return self.request.site.vars.get_value("paginate_by", None, asa=int)
+        if paginate_by := get_sitevars(self.request).get("paginate_by"):
+            return int(paginate_by)
+        return None
 
     def get_paginate_orphans(self) -> int:
         # If set explicitly on class, return it
         if orphans := super().get_paginate_orphans():
             return orphans
         # Fall back to per-site setting or 0 (Django's default)
-        return self.request.site.vars.get_value("paginate_orphans", 0, asa=int)
+        return int(get_sitevars(self.request).get("paginate_orphans") or 0)
 
     def get_queryset(self):
-        site = get_current_site(self.request)
-        qs = super().get_queryset().live().filter(site=site)
+        qs = super().get_queryset().live().filter(site=self.current_site)
         if section := self.kwargs.get("section_slug"):
             qs = qs.filter(section__slug=section)
         return qs
@@ -187,14 +266,8 @@ class BasePageListView(ListView):
                 % (opts.app_label, opts.model_name, self.template_name_suffix)
             )
 
-        # Fall back to site default if set
-        var = self.object.site.vars
-        if site_default := var.get_value("base_template"):
-            names.append(site_default)
-
-        # Fall back to commoncontent default
-        names.append("commoncontent/base.html")
-
+        # Fall back to site default if set, then commoncontent default
+        names.extend(self.get_fallback_template_names())
         return names
 
 
@@ -205,7 +278,8 @@ class ArticleListView(BasePageListView):
     def get_queryset(self):
         # Because Articles can belong to ArticlesSeries, the default ordering doesn't
         # work as expected, so we must explicitly order by date_published.
-        return super().get_queryset().order_by("-date_published")
+        # The joined section's body is never rendered in a list, so don't load it.
+        return super().get_queryset().defer("section__body").order_by("-date_published")
 
 
 ######################################################################################
@@ -221,17 +295,18 @@ class AuthorView(ArticleListView):
     def get_object(self):
         return get_object_or_404(
             Author.objects.filter(
-                site=get_current_site(self.request),
+                site=self.current_site,
                 slug=self.kwargs["author_slug"],
             )
         )
 
     def get_queryset(self):
-        return super().get_queryset().filter(author=self.get_object())
+        # self.object was already looked up by BasePageListView.get()
+        return super().get_queryset().filter(author=self.object)
 
 
 ######################################################################################
-class AuthorListView(ListView):
+class AuthorListView(SiteCachedMixin, ListView):
     model = Author
     object = None
 
@@ -245,25 +320,19 @@ class AuthorListView(ListView):
         return context
 
     def get_object(self):
-        site_name = self.request.site.vars.get_value("brand", self.request.site.name)
-        self.object = Page(
-            site=get_current_site(self.request),
+        site_name = get_sitevars(self.request).get("brand", self.current_site.name)
+        return Page(
+            site=self.current_site,
             title=f"Contributors to {site_name}",
             description="Authors who have contributed to this site.",
             date_published=timezone.now(),
         )
-        return self.object
 
     def get_template_names(self) -> T.List[str]:
         names = super().get_template_names()
 
-        # Fall back to site default if set
-        var = self.object.site.vars
-        if site_default := var.get_value("base_template"):
-            names.append(site_default)
-
-        # Fall back to commoncontent default
-        names.append("commoncontent/base.html")
+        # Fall back to site default if set, then commoncontent default
+        names.extend(self.get_fallback_template_names())
         return names
 
 
@@ -275,7 +344,7 @@ class SectionView(ArticleListView):
     def get_object(self):
         return get_object_or_404(
             Section.objects.live().filter(
-                site=get_current_site(self.request),
+                site=self.current_site,
                 slug=self.kwargs["section_slug"],
             )
         )
@@ -287,18 +356,13 @@ class HomePageView(ArticleListView):
 
     def get_object(self):
         try:
-            hp = (
-                HomePage.objects.live()
-                .filter(site=get_current_site(self.request))
-                .latest()
-            )
+            hp = HomePage.objects.get_current(self.current_site)
         except HomePage.DoesNotExist:
             # Create a phony debug home page for bootstrapping.
-            site = get_current_site(self.request)
             hp = HomePage(
-                site=site,
+                site=self.current_site,
                 admin_name="__DEBUG__",
-                title=site.name,
+                title=self.current_site.name,
                 date_published=timezone.now(),
             )
         return hp
@@ -314,6 +378,10 @@ class HomePageView(ArticleListView):
 ######################################################################################
 # FEEDS AND APIS
 ######################################################################################
+# Large text columns of related objects joined into feed items but never rendered.
+FEED_DEFERRED_FIELDS = ("section__body", "author__short_bio", "author__full_bio")
+
+
 # Custom feeds are not very well documented. This snippet shows how to
 # do this: https://djangosnippets.org/snippets/2202/
 class ContentFeed(Rss201rev2Feed):
@@ -329,15 +397,64 @@ class ContentFeed(Rss201rev2Feed):
         handler.addQuickElement("content:encoded", item["content_encoded"])
 
 
+def _with_default_author(qs):
+    """Annotate each Article in the queryset with its site's ``author_display_name``
+    SiteVar, so feeds can fall back to it without a separate lookup per item.
+    """
+    return qs.annotate(
+        default_author_name=Subquery(
+            SiteVar.objects.filter(
+                site=OuterRef("site"), name="author_display_name"
+            ).values("value")[:1]
+        )
+    )
+
+
 ######################################################################################
 class SiteFeed(Feed):
     "RSS feed of site Article Pages"
 
     feed_type = ContentFeed
 
+    def __call__(self, request, *args, **kwargs):
+        if not conf.feed_cache_timeout:
+            return super().__call__(request, *args, **kwargs)
+
+        # Key the cached feed on the newest live Article for the site, so publishing or
+        # updating an article produces a fresh feed without waiting for the timeout. The
+        # count changes when any article is unpublished or deleted, not just the newest.
+        latest = (
+            Article.objects.live()
+            .filter(site=request.site)
+            .aggregate(
+                count=Count("pk"),
+                published=Max("date_published"),
+                modified=Max("date_modified"),
+            )
+        )
+        url = request.build_absolute_uri(request.path)
+        fingerprint = (
+            f"{url}|{latest['count']}|{latest['published']}|{latest['modified']}"
+        )
+        digest = hashlib.sha256(fingerprint.encode()).hexdigest()
+        key = f"commoncontent.feed.{digest}"
+        response = cache.get(key)
+        if response is None:
+            response = super().__call__(request, *args, **kwargs)
+            cache.set(key, response, conf.feed_cache_timeout)
+        return response
+
     def get_object(self, request, *args, **kwargs):
         "For site feed, get_object will return the site"
-        return request.site
+        # request.site is shared by every request, so use a copy that values for this
+        # feed can be memoized on.
+        return copy.copy(request.site)
+
+    def get_homepage(self, obj):
+        "Return the site's current HomePage (from cache when possible), once per feed."
+        if not hasattr(obj, "_feed_homepage"):
+            obj._feed_homepage = HomePage.objects.get_current(obj)
+        return obj._feed_homepage
 
     def title(self, obj):
         tagline = obj.vars.get_value("tagline")
@@ -349,8 +466,7 @@ class SiteFeed(Feed):
         return reverse("home_page")
 
     def description(self, obj):
-        page = HomePage.objects.live().filter(site=obj).latest()
-        return page.description
+        return self.get_homepage(obj).description
 
     def feed_url(self, obj):
         return reverse("site_feed")
@@ -359,16 +475,17 @@ class SiteFeed(Feed):
         return obj.vars.get_value("author_display_name")
 
     def feed_copyright(self, obj):
-        page = HomePage.objects.live().filter(site=obj).latest()
-        return page.copyright_notice
+        return self.get_homepage(obj).copyright_notice
 
     def items(self, obj):
         paginate_by = obj.vars.get_value("paginate_by", 15, asa=int)
-        return (
+        return _with_default_author(
             Article.objects.live()
             .filter(site=obj)
-            .order_by("-date_published")[:paginate_by]
-        )
+            .select_related("author__site", "site", "section")
+            .defer(*FEED_DEFERRED_FIELDS)
+            .order_by("-date_published")
+        )[:paginate_by]
 
     def item_title(self, item):
         return item.opengraph.title
@@ -380,9 +497,12 @@ class SiteFeed(Feed):
         return item.get_absolute_url()
 
     def item_author_name(self, item):
-        if item.author:
+        if item.author_id:
             return item.author.name
-        else:
+        try:
+            return item.default_author_name
+        except AttributeError:
+            # Subclass supplied items without the annotation
             return item.site.vars.get_value("author_display_name")
 
     def item_pubdate(self, item):
@@ -436,11 +556,13 @@ class SectionFeed(SiteFeed):
 
     def items(self, obj):
         paginate_by = obj.site.vars.get_value("paginate_by", 15, asa=int)
-        return (
+        return _with_default_author(
             Article.objects.live()
             .filter(section=obj)
-            .order_by("-date_published")[:paginate_by]
-        )
+            .select_related("author__site", "section")
+            .defer(*FEED_DEFERRED_FIELDS)
+            .order_by("-date_published")
+        )[:paginate_by]
 
 
 ######################################################################################
@@ -476,5 +598,7 @@ class AuthorFeed(SiteFeed):
         return (
             Article.objects.live()
             .filter(author=obj)
+            .select_related("author__site", "site", "section")
+            .defer(*FEED_DEFERRED_FIELDS)
             .order_by("-date_published")[:paginate_by]
         )
@@ -14,6 +14,11 @@ class TinyMCEImageListView(ListView):
     ordering = "-upload_date"
     paginate_by = 25
 
+    def get_queryset(self):
+        # Renditions are generated from image_file, and is_portrait needs the
+        # dimensions. Nothing else is needed to build the list.
+        return super().get_queryset().only("title", "image_file", "width", "height")
+
     def render_to_response(
         self, context: T.Dict[str, T.Any], **response_kwargs: T.Any
     ) -> HttpResponse:
@@ -1,8 +1,13 @@
 from django.apps import apps
 from django.contrib.admin import site
 from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+
+from commoncontent.models import Article, Author, HomePage, Link, Menu, Section
 
 
 class AdminSmokeTest(TestCase):
@@ -35,3 +40,84 @@ class AdminSmokeTest(TestCase):
                 resp_add = self.client.get(add_url)
                 self.assertEqual(resp_changelist.status_code, 200)
                 self.assertEqual(resp_add.status_code, 200)
+
+    def assertChangelistQueriesConstant(self, model_name, make_object):
+        """Adding rows to a changelist should not add queries."""
+        self.client.force_login(self.user)
+        url = reverse(f"admin:commoncontent_{model_name}_changelist")
+        make_object(0)
+        self.client.get(url)  # Warm the site and sitevar caches.
+        with CaptureQueriesContext(connection) as one:
+            self.client.get(url)
+        for n in range(1, 5):
+            make_object(n)
+        with CaptureQueriesContext(connection) as many:
+            self.client.get(url)
+        self.assertEqual(len(one), len(many))
+
+    def test_article_changelist_queries_constant(self):
+        section = Section.objects.create(
+            site_id=1, title="Section", slug="section", date_published=timezone.now()
+        )
+
+        def make_article(n):
+            Article.objects.create(
+                site_id=1,
+                section=section,
+                title=f"Article {n}",
+                slug=f"article-{n}",
+                date_published=timezone.now(),
+            )
+
+        self.assertChangelistQueriesConstant("article", make_article)
+
+    def test_author_changelist_queries_constant(self):
+        def make_author(n):
+            Author.objects.create(site_id=1, name=f"Author {n}", slug=f"author-{n}")
+
+        self.assertChangelistQueriesConstant("author", make_author)
+
+    def test_homepage_changelist_queries_constant(self):
+        def make_homepage(n):
+            HomePage.objects.create(
+                site_id=1,
+                admin_name=f"home-{n}",
+                title=f"Home {n}",
+                slug=f"home-{n}",
+                date_published=timezone.now(),
+            )
+
+        self.assertChangelistQueriesConstant("homepage", make_homepage)
+
+    def test_menu_change_form_queries_constant(self):
+        """Adding Links to a Menu should not add queries to its change form."""
+        self.client.force_login(self.user)
+        menu = Menu.objects.create(site_id=1, admin_name="Main", slug="main")
+        url = reverse("admin:commoncontent_menu_change", args=[menu.pk])
+        Link.objects.create(menu=menu, url="/0", title="Link 0")
+        self.client.get(url)  # Warm the site and sitevar caches.
+        with CaptureQueriesContext(connection) as one:
+            self.client.get(url)
+        for n in range(1, 5):
+            Link.objects.create(menu=menu, url=f"/{n}", title=f"Link {n}")
+        with CaptureQueriesContext(connection) as many:
+            self.client.get(url)
+        self.assertEqual(len(one), len(many))
+
+    def test_article_author_autocomplete(self):
+        """Article's author field is served by the admin autocomplete view."""
+        self.client.force_login(self.user)
+        Author.objects.create(site_id=1, name="Samuel Clemens", slug="samuel-clemens")
+        Author.objects.create(site_id=1, name="Jane Austen", slug="jane-austen")
+        resp = self.client.get(
+            reverse("admin:autocomplete"),
+            {
+                "app_label": "commoncontent",
+                "model_name": "article",
+                "field_name": "author",
+                "term": "clemens",
+            },
+        )
+        self.assertEqual(resp.status_code, 200)
+        results = resp.json()["results"]
+        self.assertEqual([r["text"] for r in results], ["Samuel Clemens"])
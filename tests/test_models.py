@@ -1,8 +1,11 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from unittest import mock
 
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase as DjangoTestCase
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from sitevars.models import SiteVar
@@ -38,6 +41,15 @@ class TestModels(DjangoTestCase):
         )
         self.assertIn("2021 custom copyright notice", page.copyright_notice)
 
+    def test_copyright_notice_static_custom(self):
+        """A custom notice without a placeholder is used as-is, HTML included."""
+        page = Page(
+            title="Test Page",
+            site=Site.objects.get(id=1),
+            custom_copyright_notice="<b>&copy; ACME</b>",
+        )
+        self.assertEqual(page.copyright_notice, "<b>&copy; ACME</b>")
+
     def test_copyright_notice_site_has_fallback(self):
         """Page has no custom_copyright_notice.
         Site has a SiteVar setting the site-wide copyright notice. Pub year
@@ -74,6 +86,17 @@ class TestModels(DjangoTestCase):
         )
         self.assertIn("2021 custom holder. All rights", page.copyright_notice)
 
+    def test_copyright_notice_escapes_holder(self):
+        """The copyright holder is text, so it is escaped in the default notice."""
+        site = Site.objects.get(id=1)
+        SiteVar.objects.create(site=site, name="copyright_holder", value="Tom & Jerry")
+        page = Page(
+            title="Test Page",
+            site=site,
+            date_published=datetime.fromisoformat("2021-11-22T19:00"),
+        )
+        self.assertIn("2021 Tom &amp; Jerry. All rights", page.copyright_notice)
+
     def test_copyright_notice_default(self):
         """Page has no custom_copyright_notice.
         Site has no SiteVar copyright settings. Pub year
@@ -89,6 +112,11 @@ class TestModels(DjangoTestCase):
         )
         self.assertIn("2021 example.com. All rights", page.copyright_notice)
 
+    def test_locale_default_follows_language_code(self):
+        """The locale default is read from LANGUAGE_CODE when a page is created."""
+        with override_settings(LANGUAGE_CODE="fr-ca"):
+            self.assertEqual(Page(title="Test Page").locale, "fr_CA")
+
     def test_explicit_excerpt(self):
         """Page has a pagebreak marker for excerpt. Should return only content before
         the marker.
@@ -139,6 +167,42 @@ class TestModels(DjangoTestCase):
         with override_settings(COMMONCONTENT_EXCERPT_MAX_WORDS=3):
             self.assertHTMLEqual(page.excerpt, expected)
 
+    def test_excerpt_custom_pagebreak_separator(self):
+        """The pagebreak separator comes from TinyMCE's config, with a fallback."""
+        body = "<p>First.</p><!-- more --><p>Second.</p>"
+        with override_settings(
+            TINYMCE_DEFAULT_CONFIG={"pagebreak_separator": "<!-- more -->"}
+        ):
+            self.assertNotIn("Second.", Page(body=body).excerpt)
+        with override_settings(TINYMCE_DEFAULT_CONFIG={}):
+            self.assertIn("Second.", Page(body=body).excerpt)
+        with override_settings(TINYMCE_DEFAULT_CONFIG=None):
+            self.assertIn("Second.", Page(body=body).excerpt)
+
+    def test_excerpt_follows_edits(self):
+        """The cached excerpt is recomputed after the body is saved or reloaded."""
+        site = Site.objects.get(id=1)
+        page = Page.objects.create(
+            title="Test Page", slug="test-page", site=site, body="<p>Old body.</p>"
+        )
+        self.assertEqual(page.excerpt, "<p>Old body.</p>")
+        page.body = "<p>New body.</p>"
+        page.save()
+        self.assertEqual(page.excerpt, "<p>New body.</p>")
+        Page.objects.filter(pk=page.pk).update(body="<p>Newer body.</p>")
+        page.refresh_from_db()
+        self.assertEqual(page.excerpt, "<p>Newer body.</p>")
+
+    def test_excerpt_computed_once(self):
+        """has_excerpt should reuse the excerpt rather than truncating again."""
+        page = Page(title="Test Page", body="<p>First paragraph.</p>")
+        with mock.patch(
+            "commoncontent.models.truncatewords_html", return_value="<p>First</p>"
+        ) as truncate:
+            self.assertEqual(page.excerpt, "<p>First</p>")
+            self.assertTrue(page.has_excerpt)
+        truncate.assert_called_once()
+
 
 def upload_to_target_for_test(instance, filename):
     return "arf.jpg"
@@ -232,6 +296,40 @@ class ArticleModelTest(DjangoTestCase):
         )
         self.assertEqual(self.article_without_series.get_absolute_url(), expected_url)
 
+    def test_derived_properties_follow_edits(self):
+        """url and copyright_year reflect the current field values, not stale ones."""
+        article = Article.objects.get(pk=self.article_without_series.pk)
+        self.assertEqual(article.opengraph.url, article.url)
+        article.slug = "renamed"
+        article.date_published = timezone.now().replace(year=2001)
+        self.assertTrue(article.url.endswith("/renamed.html"))
+        self.assertEqual(article.opengraph.url, article.url)
+        self.assertEqual(article.copyright_year, 2001)
+        article.refresh_from_db()
+        self.assertEqual(article.url, self.article_without_series.url)
+
+    def test_tag_names_read_once(self):
+        """schema and opengraph share one read of the tags, or none if prefetched."""
+        self.article_with_series.tags.add("alpha", "beta")
+        article = Article.objects.get(pk=self.article_with_series.pk)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(sorted(article.schema.keywords), ["alpha", "beta"])
+            self.assertEqual(sorted(article.opengraph.tag), ["alpha", "beta"])
+        tag_queries = [q for q in queries if "taggit_tag" in q["sql"]]
+        self.assertEqual(len(tag_queries), 1)
+        article = Article.objects.prefetch_related("tags").get(pk=article.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(sorted(article.tag_names), ["alpha", "beta"])
+
+    def test_tag_names_follow_tag_changes(self):
+        """tag_names is re-read after the object's tags change."""
+        article = Article.objects.get(pk=self.article_with_series.pk)
+        self.assertEqual(article.tag_names, [])
+        article.tags.add("alpha")
+        self.assertEqual(article.tag_names, ["alpha"])
+        article.tags.clear()
+        self.assertEqual(article.tag_names, [])
+
 
 class TestMenuModel(DjangoTestCase):
     def setUp(self):
@@ -250,8 +348,32 @@ class TestMenuModel(DjangoTestCase):
         link2 = Link.objects.create(menu=self.menu, url="/link2", title="Link 2")
         self.assertQuerySetEqual(self.menu.links, [link1, link2], ordered=False)
 
+    def test_link_icon_name(self):
+        """Links use their custom icon, or the site's default via their menu."""
+        link = Link.objects.create(menu=self.menu, url="/link1", title="Link 1")
+        self.assertEqual(link.icon_name, "link-45deg")
+        link = Link(menu=self.menu, url="/link2", custom_icon="star")
+        self.assertEqual(link.icon_name, "star")
+
+    def test_menu_links_follow_refresh(self):
+        """Refreshing a menu from the database re-reads its links."""
+        self.assertEqual(self.menu.links, [])
+        link = Link.objects.create(menu=self.menu, url="/link1", title="Link 1")
+        self.menu.refresh_from_db()
+        self.assertEqual(self.menu.links, [link])
+
+    def test_menu_links_cached(self):
+        """Accessing links a second time should not query the database again."""
+        Link.objects.create(menu=self.menu, url="/link1", title="Link 1")
+        links = self.menu.links
+        with self.assertNumQueries(0):
+            self.assertEqual(self.menu.links, links)
+
 
 class TestSectionMenu(DjangoTestCase):
+    def setUp(self):
+        cache.clear()
+
     def test_section_menu_links(self):
         """Test the links property when both HomePage and Sections exist."""
         site = Site.objects.get(id=1)
@@ -312,3 +434,86 @@ class TestSectionMenu(DjangoTestCase):
         section_menu = SectionMenu(site=site)
         self.assertIn(homepage, section_menu.links)
         self.assertEqual(len(section_menu.links), 1)
+
+    def test_section_menu_links_cached(self):
+        """Accessing links a second time should not query the database again."""
+        site = Site.objects.get(id=1)
+        Section.objects.create(
+            site=site,
+            title="Section 1",
+            slug="section-1",
+            date_published=timezone.now(),
+        )
+        section_menu = SectionMenu(site=site)
+        links = section_menu.links
+        with self.assertNumQueries(0):
+            self.assertEqual(section_menu.links, links)
+
+    def test_section_menu_homepage_cached(self):
+        """Each new SectionMenu should reuse the site's cached HomePage."""
+        site = Site.objects.get(id=1)
+        homepage = HomePage.objects.create(
+            site=site, title="Home", slug="home", date_published=timezone.now()
+        )
+        with self.assertNumQueries(2):
+            self.assertEqual(SectionMenu(site=site).links, [homepage])
+        # Only the sections query remains, and none if the sections are supplied.
+        with self.assertNumQueries(1):
+            self.assertEqual(SectionMenu(site=site).links, [homepage])
+        with self.assertNumQueries(0):
+            self.assertEqual(SectionMenu(site=site, sections=[]).links, [homepage])
+
+
+class TestHomePageManager(DjangoTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_get_current_cached(self):
+        """The current HomePage should be served from cache until one is saved."""
+        site = Site.objects.get(id=1)
+        old = HomePage.objects.create(
+            site=site,
+            admin_name="old",
+            title="Old",
+            slug="old",
+            date_published=timezone.now() - timedelta(days=1),
+        )
+        self.assertEqual(HomePage.objects.get_current(site), old)
+        with self.assertNumQueries(0):
+            self.assertEqual(HomePage.objects.get_current(site), old)
+        with self.captureOnCommitCallbacks(execute=True):
+            new = HomePage.objects.create(
+                site=site,
+                admin_name="new",
+                title="New",
+                slug="new",
+                date_published=timezone.now(),
+            )
+            # Not cleared until the transaction commits
+            self.assertEqual(HomePage.objects.get_current(site), old)
+        self.assertEqual(HomePage.objects.get_current(site), new)
+        with self.captureOnCommitCallbacks(execute=True):
+            new.delete()
+        self.assertEqual(HomePage.objects.get_current(site), old)
+
+    def test_get_current_cleared_when_moved(self):
+        """Moving a HomePage to another site clears the cache of both sites."""
+        site = Site.objects.get(id=1)
+        other = Site.objects.create(name="Other", domain="other.example.com")
+        with self.captureOnCommitCallbacks(execute=True):
+            HomePage.objects.create(
+                site=site,
+                admin_name="home",
+                title="Home",
+                slug="home",
+                date_published=timezone.now(),
+            )
+        home = HomePage.objects.get_current(site)
+        with self.assertRaises(HomePage.DoesNotExist):
+            HomePage.objects.get_current(other)
+        home.site = other
+        with self.captureOnCommitCallbacks(execute=True):
+            home.save()
+        with self.assertRaises(HomePage.DoesNotExist):
+            HomePage.objects.get_current(site)
+        self.assertEqual(HomePage.objects.get_current(other), home)
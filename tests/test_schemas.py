@@ -1,12 +1,16 @@
 import datetime
 import unittest
 
+from django.utils.html import format_html
+
 from commoncontent.schemas import (
     AudioProp,
     CreativeWorkSchema,
     ImageProp,
     OGArticle,
+    OGBook,
     ThingSchema,
+    validate_http_url,
 )
 
 
@@ -94,6 +98,37 @@ class TestOpenGraphSchemas(unittest.TestCase):
         # When set to a date, value is converted to isoformat
         self.assertIn("2022-06-30", str(a))
 
+    def test_article_schema_escapes_content(self):
+        a = OGArticle(
+            title='Say "hello" <world>',
+            url="https://example.com/",
+        )
+        self.assertIn(
+            'property="og:title" content="Say &quot;hello&quot; &lt;world&gt;"', str(a)
+        )
+
+    def test_article_schema_does_not_escape_safe_content(self):
+        a = OGArticle(
+            title="Safe title",
+            url="https://example.com/",
+            description=format_html("{} &amp; {}", "Tom", "Jerry"),
+        )
+        self.assertIn('property="og:description" content="Tom &amp; Jerry"', str(a))
+
+    def test_book_schema_authors(self):
+        b = OGBook(
+            title="My Book",
+            url="https://example.com/",
+            isbn="978-3-16-148410-0",
+            author=["Ann", "Bob"],
+            tag=["fiction"],
+        )
+        self.assertIn('property="og:type" content="book"', str(b))
+        self.assertIn('property="book:isbn" content="978-3-16-148410-0"', str(b))
+        self.assertIn('property="book:author" content="Ann"', str(b))
+        self.assertIn('property="book:author" content="Bob"', str(b))
+        self.assertIn('property="book:tag" content="fiction"', str(b))
+
 
 class TestThingSchema(unittest.TestCase):
     def test_thing_schema_registry(self):
@@ -116,3 +151,14 @@ class TestThingSchema(unittest.TestCase):
             """ "@type": "Thing"}</script>"""
         )
         self.assertEqual(out, expected)
+
+
+class TestValidateHttpUrl(unittest.TestCase):
+    def test_validate_http_url(self):
+        url = "https://example.com/page.html"
+        self.assertEqual(validate_http_url(url), url)
+        self.assertEqual(validate_http_url(url), url)
+        # Errors are raised every time, not cached
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                validate_http_url("ftp://example.com/")
@@ -1,8 +1,11 @@
 from datetime import datetime
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
-from commoncontent.models import Menu, Page, Status
+from commoncontent.common import get_sitevars
+from commoncontent.models import Link, Menu, Page, Status
 from django.contrib.sites.models import Site
+from django.contrib.sites.shortcuts import get_current_site
+from django.core.cache import cache
 from django.core.paginator import Paginator
 from django.template import Context, Template
 from django.test import RequestFactory, SimpleTestCase, override_settings
@@ -29,6 +32,14 @@ class TestAddClassesFilter(SimpleTestCase):
             attrs={"class": "class1 classB newclass secondclass"}
         )
 
+    def test_add_classes_no_duplicates(self):
+        mock = Mock()
+        mock.field.widget.attrs = {"class": "class1  classB"}
+        Template(
+            '{% load commoncontent %}{{ fakefield|add_classes:"classB new" }} '
+        ).render(Context({"fakefield": mock}))
+        mock.as_widget.assert_called_with(attrs={"class": "class1 classB new"})
+
 
 class TestElidedRangeFilter(SimpleTestCase):
     def test_elided_range_large(self):
@@ -92,6 +103,20 @@ class TestCopyrightNoticeTag(DjangoTestCase):
 
         self.assertIn(f"{year} sitewide copyright", output)
 
+    def test_copyright_notice_site_has_static_fallback(self):
+        """A site-wide notice with no placeholder is output as-is."""
+        site = Site.objects.get(id=1)
+        SiteVar.objects.create(
+            site=site, name="copyright_notice", value="&copy; ACME, forever"
+        )
+        request = RequestFactory().get("/page.html")
+        request.site = site
+        output = Template("{% load commoncontent %}{% copyright_notice %} ").render(
+            Context({"request": request, "object": object()})
+        )
+
+        self.assertEqual(output, "&copy; ACME, forever ")
+
     def test_copyright_notice_site_has_holder(self):
         """Context contains an object that has no copyright_notice prop.
         Site has a SiteVar setting the copyright holder. Var copyright_holder
@@ -123,9 +148,35 @@ class TestCopyrightNoticeTag(DjangoTestCase):
         )
         self.assertIn(f"{year} example.com. All rights", output)
 
+    @patch("commoncontent.templatetags.commoncontent.get_current_site")
+    def test_copyright_notice_uses_request_sitevars(self, current_site):
+        """The tag reuses the SiteVars already loaded for the request."""
+        site = Site.objects.get(id=1)
+        SiteVar.objects.create(
+            site=site, name="copyright_holder", value="custom holder"
+        )
+        request = RequestFactory().get("/page.html")
+        request.site = site
+        get_sitevars(request)
+        with self.assertNumQueries(0):
+            output = Template("{% load commoncontent %}{% copyright_notice %} ").render(
+                Context({"request": request, "object": object()})
+            )
+        self.assertIn("custom holder. All rights", output)
+        current_site.assert_not_called()
+
+    def test_copyright_notice_without_request(self):
+        """Without a request, the notice falls back to the SITE_ID site."""
+        year = datetime.now().year
+        output = Template("{% load commoncontent %}{% copyright_notice %} ").render(
+            Context({"object": object()})
+        )
+        self.assertIn(f"{year} example.com. All rights", output)
+
 
 class TestMenuTags(DjangoTestCase):
     def setUp(self):
+        cache.clear()
         self.site = Site.objects.get(id=1)
         self.request = RequestFactory().get("/")
         self.request.site = self.site
@@ -140,6 +191,57 @@ class TestMenuTags(DjangoTestCase):
         ).render(self.context)
         self.assertIn("Main Navigation", output)
 
+    def test_menu_cached(self):
+        """The menu and its links should be served from cache until either is saved."""
+        menu = Menu.objects.create(site=self.site, slug="footer", admin_name="Footer")
+        menu.link_set.create(url="/about/", title="About")
+        template = Template(
+            '{% load commoncontent %}{% menu "footer" as menu %}'
+            "{% for link in menu.links %}{{ link.title }} {% endfor %}"
+        )
+        get_current_site(self.request)  # Warm the site cache
+        self.assertEqual(template.render(self.context).strip(), "About")
+        with self.assertNumQueries(0):
+            self.assertEqual(template.render(self.context).strip(), "About")
+        with self.captureOnCommitCallbacks(execute=True):
+            menu.link_set.create(url="/contact/", title="Contact")
+            # Not cleared until the transaction commits
+            self.assertEqual(template.render(self.context).strip(), "About")
+        self.assertEqual(template.render(self.context).strip(), "About Contact")
+        with self.captureOnCommitCallbacks(execute=True):
+            menu.delete()
+        self.assertEqual(template.render(self.context).strip(), "")
+
+    def test_menu_cache_cleared_on_rename(self):
+        """Renaming a menu clears the cache under both its old and new slugs."""
+        with self.captureOnCommitCallbacks(execute=True):
+            Menu.objects.create(site=self.site, slug="footer", admin_name="Footer")
+        template = Template(
+            '{% load commoncontent %}{% menu "footer" as menu %}{{ menu }}'
+        )
+        self.assertEqual(template.render(self.context), "Footer")
+        menu = Menu.objects.get(site=self.site, slug="footer")
+        menu.slug = "bottom"
+        with self.captureOnCommitCallbacks(execute=True):
+            menu.save()
+        self.assertEqual(template.render(self.context), "None")
+
+    def test_menu_cache_cleared_when_link_moves(self):
+        """Moving a link to another menu clears the cache of both menus."""
+        footer = Menu.objects.create(site=self.site, slug="footer", admin_name="Footer")
+        other = Menu.objects.create(site=self.site, slug="other", admin_name="Other")
+        footer.link_set.create(url="/about/", title="About")
+        template = Template(
+            '{% load commoncontent %}{% menu "footer" as menu %}'
+            "{% for link in menu.links %}{{ link.title }}{% endfor %}"
+        )
+        self.assertEqual(template.render(self.context), "About")
+        link = Link.objects.get(title="About")
+        link.menu = other
+        with self.captureOnCommitCallbacks(execute=True):
+            link.save()
+        self.assertEqual(template.render(self.context), "")
+
     def test_menu_does_not_exist(self):
         output = Template(
             '{% load commoncontent %}{% menu "non-existent" as menu %}{{ menu }}'
@@ -152,6 +254,26 @@ class TestMenuTags(DjangoTestCase):
         ).render(self.context)
         self.assertIn("SectionMenu", output)
 
+    def test_menu_nav(self):
+        menu = Menu.objects.create(site=self.site, slug="main-nav", admin_name="Main")
+        menu.link_set.create(url="/", title="Home")
+        menu.link_set.create(url="/section/", title="Section")
+        menu.link_set.create(url="/other/", title="Other")
+        template = Template('{% load commoncontent %}{% menu_nav "main-nav" %}')
+        self.request.path = "/section/"
+        output = template.render(self.context)
+        self.assertEqual(output.count('class="nav-link active"'), 1)
+        self.assertEqual(output.count('aria-current="page"'), 1)
+        self.assertIn('<a href="/section/"\n         class="nav-link active"', output)
+        self.request.path = "/section/page/"
+        output = template.render(self.context)
+        self.assertEqual(output.count('class="nav-link active"'), 1)
+        self.assertEqual(output.count('aria-current="section"'), 2)
+        self.request.path = "/"
+        output = template.render(self.context)
+        self.assertIn('<a href="/"\n         class="nav-link active"', output)
+        self.assertEqual(output.count('class="nav-link active"'), 1)
+
     def test_menu_active_root_url(self):
         self.request.path = "/"
         output = Template('{% load commoncontent %}{% menu_active "/" %}').render(
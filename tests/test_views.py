@@ -3,14 +3,18 @@ from datetime import timedelta
 from io import BytesIO
 
 from django.apps import apps
+from django.core.cache import cache
 from django.core.files.base import ContentFile
+from django.db import connection
 from django.http import HttpResponseNotFound
-from django.test import TestCase
-from django.urls import reverse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
 from django.utils import timezone
 from PIL import Image as PILImage
 from sitevars.models import SiteVar
 
+from commoncontent.apps import _is_list_view, context_defaults
 from commoncontent.models import (
     Article,
     ArticleSeries,
@@ -23,9 +27,14 @@ from commoncontent.models import (
     Status,
 )
 from commoncontent.sitemaps import ArticleSitemap
+from commoncontent.views import ArticleDetailView, SectionView, ShortListPaginator
 
 
 class TestHomePageView(TestCase):
+    def setUp(self):
+        # HomePages are cached per site, and test rollbacks send no signals.
+        cache.clear()
+
     def test_no_hp_in_db(self):
         """When no HomePages in DB (and DEBUG is True), should show default dev page"""
         resp = self.client.get(reverse("home_page"))
@@ -331,6 +340,74 @@ class TestSectionView(TestCase):
             resp.content.find(article2.title.encode()),
         )
 
+    def test_section_paginate_by_sitevar(self):
+        """The paginate_by SiteVar controls the number of articles per page."""
+        site = Site.objects.get_current()
+        # SiteVar clears its cache on commit
+        with self.captureOnCommitCallbacks(execute=True):
+            SiteVar.objects.create(site=site, name="paginate_by", value="2")
+        section = Section.objects.create(
+            site=site,
+            slug="test-section",
+            title="Test Section 1",
+            date_published=timezone.now(),
+        )
+        for i in range(3):
+            Article.objects.create(
+                site=site,
+                section=section,
+                title=f"Article {i}",
+                slug=f"article-{i}",
+                date_published=timezone.now() - timedelta(days=i),
+            )
+
+        resp = self.client.get(
+            reverse("section_page", kwargs={"section_slug": "test-section"})
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.context["paginator"].per_page, 2)
+        self.assertEqual(len(resp.context["object_list"]), 2)
+
+
+class TestShortListPaginator(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        section = Section.objects.create(
+            site_id=1, slug="test-section", date_published=timezone.now()
+        )
+        for i in range(5):
+            Article.objects.create(
+                site_id=1,
+                section=section,
+                title=f"Article {i}",
+                slug=f"article-{i}",
+                date_published=timezone.now() - timedelta(days=i),
+            )
+        cls.articles = Article.objects.order_by("-date_published")
+
+    def test_single_page_skips_count(self):
+        paginator = ShortListPaginator(self.articles, 5)
+        with self.assertNumQueries(1):
+            page = paginator.page(1)
+            self.assertEqual(len(page), 5)
+            self.assertFalse(page.has_next())
+            self.assertEqual(paginator.num_pages, 1)
+
+    def test_orphans_fit_on_single_page(self):
+        paginator = ShortListPaginator(self.articles, 4, orphans=1)
+        with self.assertNumQueries(1):
+            page = paginator.page("1")
+            self.assertEqual(len(page), 5)
+            self.assertFalse(page.has_next())
+
+    def test_multiple_pages(self):
+        paginator = ShortListPaginator(self.articles, 2)
+        page = paginator.page(1)
+        self.assertEqual(list(page), list(self.articles[:2]))
+        self.assertTrue(page.has_next())
+        self.assertEqual(paginator.num_pages, 3)
+        self.assertEqual(list(paginator.page(3)), list(self.articles[4:]))
+
 
 class BaseContentTestCase(TestCase):
     """A base class that sets up some content for testing"""
@@ -381,6 +458,10 @@ class BaseContentTestCase(TestCase):
         cls.article = article
         cls.article2 = article2
 
+    def setUp(self):
+        # HomePages are cached per site, and test rollbacks send no signals.
+        cache.clear()
+
 
 class TestArticlesAndFeeds(BaseContentTestCase):
     def test_article(self):
@@ -396,6 +477,21 @@ class TestArticlesAndFeeds(BaseContentTestCase):
         self.assertContains(resp, self.article.title)
         self.assertContains(resp, '''property="og:type" content="article"''')
 
+    def test_article_fetched_once(self):
+        """The article should be looked up with a single query."""
+        url = reverse(
+            "article_page",
+            kwargs={"section_slug": "test-section", "article_slug": "test-article"},
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(url)
+        article_lookups = [
+            q
+            for q in ctx.captured_queries
+            if '"commoncontent_article"."slug" =' in q["sql"]
+        ]
+        self.assertEqual(len(article_lookups), 1)
+
     def test_article_draft(self):
         """Draft Article page should not be found."""
         Article.objects.create(
@@ -455,6 +551,61 @@ class TestArticlesAndFeeds(BaseContentTestCase):
         resp = self.client.get(reverse("site_feed"))
         self.assertEqual(resp.status_code, 200)
 
+    def test_site_rss_default_author(self):
+        """Items without an author fall back to the author_display_name SiteVar."""
+        site = Site.objects.get_current()
+        site.vars.create(name="author_display_name", value="Site Staff")
+        resp = self.client.get(reverse("site_feed"))
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, "Site Staff</dc:creator>")
+
+    @override_settings(COMMONCONTENT_FEED_CACHE_TIMEOUT=60)
+    def test_site_rss_cached(self):
+        """Cached feed is reused until a newer article is published."""
+        resp = self.client.get(reverse("site_feed"))
+        self.assertEqual(resp.status_code, 200)
+        with self.assertNumQueries(1):
+            cached = self.client.get(reverse("site_feed"))
+        self.assertEqual(cached.content, resp.content)
+
+        Article.objects.create(
+            site=self.site,
+            section=self.section,
+            title="Brand New Article",
+            slug="brand-new-article",
+            date_published=timezone.now(),
+        )
+        resp = self.client.get(reverse("site_feed"))
+        self.assertContains(resp, "Brand New Article")
+
+    @override_settings(COMMONCONTENT_FEED_CACHE_TIMEOUT=60)
+    def test_site_rss_cache_drops_unpublished(self):
+        """Unpublishing an article other than the newest refreshes the cached feed."""
+        Article.objects.create(
+            site=self.site,
+            section=self.section,
+            title="Brand New Article",
+            slug="brand-new-article",
+            date_published=timezone.now(),
+        )
+        self.assertContains(self.client.get(reverse("site_feed")), self.article.title)
+
+        self.article.status = Status.CANCELLED
+        self.article.save()
+        resp = self.client.get(reverse("site_feed"))
+        self.assertNotContains(resp, self.article.title)
+        self.assertContains(resp, "Brand New Article")
+
+    def test_site_rss_homepage_cached(self):
+        """The site feed uses the cached HomePage rather than querying for it."""
+        self.client.get(reverse("site_feed"))
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(reverse("site_feed"))
+        self.assertEqual(resp.status_code, 200)
+        self.assertFalse(
+            [q for q in ctx.captured_queries if "commoncontent_homepage" in q["sql"]]
+        )
+
     def test_section_rss(self):
         resp = self.client.get(
             reverse("section_feed", kwargs={"section_slug": self.section.slug})
@@ -501,6 +652,47 @@ class TestViewsGetRightTemplateVars(BaseContentTestCase):
             with self.subTest("Check for var in context", block=tpl):
                 self.assertIn(tpl, resp.context)
 
+    def _request_for(self, url):
+        request = RequestFactory().get(url)
+        request.resolver_match = resolve(url)
+        request.site = self.site
+        return request
+
+    def test_context_defaults_not_shared(self):
+        """Default context variables are read-only, and each request gets its own."""
+        url = reverse(
+            "article_page",
+            kwargs={"section_slug": "test-section", "article_slug": "test-article"},
+        )
+        first = context_defaults(self._request_for(url))
+        with self.assertRaises(TypeError):
+            first["content_template"] = "changed.html"
+        self.assertIsNot(context_defaults(self._request_for(url)), first)
+
+    def test_context_defaults_computed_once_per_request(self):
+        """Rendering several contexts for one request reuses the defaults."""
+        url = reverse("section_page", kwargs={"section_slug": "test-section"})
+        request = self._request_for(url)
+        first = context_defaults(request)
+        with self.assertNumQueries(0):
+            self.assertIs(context_defaults(request), first)
+
+    def test_is_list_view(self):
+        def article_list(request):
+            pass
+
+        def list_articles(request):
+            pass
+
+        def article_detail(request):
+            pass
+
+        self.assertTrue(_is_list_view(article_list))
+        self.assertTrue(_is_list_view(list_articles))
+        self.assertFalse(_is_list_view(article_detail))
+        self.assertTrue(_is_list_view(SectionView.as_view()))
+        self.assertFalse(_is_list_view(ArticleDetailView.as_view()))
+
     def test_detail_pages(self):
         config = apps.get_app_config("commoncontent")
 
@@ -603,6 +795,21 @@ class TestViewsGetRightTemplateVars(BaseContentTestCase):
             resp.context["postcontent_template"],
         )
 
+    def test_urlconf_block_overrides(self):
+        """Block templates passed as view kwargs in the urlconf override defaults."""
+        request = RequestFactory().get("/test-section/")
+        request.site = self.site
+        resp = SectionView.as_view()(
+            request,
+            section_slug="test-section",
+            header_template="commoncontent/blocks/empty.html",
+            footer_template="",
+        )
+        self.assertEqual(
+            "commoncontent/blocks/empty.html", resp.context_data["header_template"]
+        )
+        self.assertNotIn("footer_template", resp.context_data)
+
 
 class TestTinyMCEImageListView(TestCase):
     def test_get(self):
@@ -666,6 +873,49 @@ class ArticleSeriesViewsTest(BaseContentTestCase):
             ),
         )
 
+    def test_redirect_single_query(self):
+        url = reverse(
+            "series_page",
+            kwargs={
+                "section_slug": self.series_article.section.slug,
+                "series_slug": self.series.slug,
+            },
+        )
+        self.client.get(url)  # Warm the site cache
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 301)
+
+    @override_settings(COMMONCONTENT_SERIES_REDIRECT_CACHE_TIMEOUT=60)
+    def test_redirect_cached(self):
+        cache.clear()
+        url = reverse(
+            "series_page",
+            kwargs={
+                "section_slug": self.series_article.section.slug,
+                "series_slug": self.series.slug,
+            },
+        )
+        first = self.client.get(url)
+        self.assertIn("public", first["Cache-Control"])
+        self.assertIn("max-age=60", first["Cache-Control"])
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 301)
+        self.assertEqual(response.url, first.url)
+
+    def test_series_not_found(self):
+        response = self.client.get(
+            reverse(
+                "series_page",
+                kwargs={
+                    "section_slug": self.section.slug,
+                    "series_slug": "no-such-series",
+                },
+            )
+        )
+        self.assertEqual(response.status_code, 404)
+
     def test_article_with_series_redirect(self):
         """
         Test that a request to "<section_slug>/<article_slug>.html" redirects to
@@ -724,6 +974,17 @@ class TestAuthorViews(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, self.author.name)
 
+    def test_author_page_looks_up_author_once(self):
+        url = reverse("author_page", kwargs={"author_slug": self.author.slug})
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(url)
+        author_lookups = [
+            q
+            for q in ctx.captured_queries
+            if '"commoncontent_author"."slug" =' in q["sql"]
+        ]
+        self.assertEqual(len(author_lookups), 1)
+
     def test_author_page_paginated(self):
         response = self.client.get(
             reverse(
@@ -767,3 +1028,12 @@ class ArticleSitemapTest(BaseContentTestCase):
     def test_items_order(self):
         items = list(self.sitemap.items())
         self.assertEqual(items, [self.article, self.article3, self.article4])
+
+    def test_items_urls_without_extra_queries(self):
+        """Sitemap items defer the body but need no queries to build their URLs."""
+        items = list(self.sitemap.items())
+        self.assertIn("body", items[0].get_deferred_fields())
+        with self.assertNumQueries(0):
+            for item in items:
+                self.sitemap.location(item)
+                self.sitemap.lastmod(item)